@@ -1,11 +1,123 @@
 from __future__ import absolute_import
+import base64
+import collections
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
 import requests
 import logging
+import urllib3
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover – optional HTTP/2 backend.
+    httpx = None
+
+try:
+    from requests_toolbelt import MultipartEncoder
+    from requests_toolbelt.multipart.encoder import FileWrapper
+except ImportError:  # pragma: no cover – optional streaming uploads.
+    MultipartEncoder = None
 
 API_ENDPOINT = "https://api.remove.bg/v1.0/removebg"
 
-_logger = logging.getLogger(__name__)
+# Errors go only to the log files given to RemoveBg, not the root logger.
+_logger = logging.getLogger("removebg")
+_logger.propagate = False
+
+# Absolute paths of error log files that already have a handler attached.
+_installed_handlers = set()
+
+# Allowed values for the validated remove.bg form fields.
+_SIZES = frozenset({
+    "auto", "preview", "small", "regular", "medium", "hd", "full", "4k"})
+_TYPES = frozenset({
+    "auto", "person", "product", "animal", "car", "car_interior",
+    "car_part", "transportation", "graphics", "other"})
+_TYPE_LEVELS = frozenset({"none", "latest", "1", "2"})
+_FORMATS = frozenset({"jpg", "zip", "png", "auto"})
+_CHANNELS = frozenset({"rgba", "alpha"})
+
+
+def _make_validator(sizes, types, type_levels, formats, channels_):
+    """Return a function validating arguments against the given sets."""
+    def validate(size, type, type_level, format, channels):
+        if size not in sizes:
+            raise ValueError("size argument wrong")
+        if type not in types:
+            raise ValueError("type argument wrong")
+        if type_level not in type_levels:
+            raise ValueError("type_level argument wrong")
+        if format not in formats:
+            raise ValueError("format argument wrong")
+        if channels not in channels_:
+            raise ValueError("channels argument wrong")
+    return validate
+
+
+# Built once so every call checks against bound sets, not module globals.
+_validate = _make_validator(_SIZES, _TYPES, _TYPE_LEVELS, _FORMATS, _CHANNELS)
+
+# Form encoding of boolean flags.
+_BOOL = {True: 'true', False: 'false'}
+
+# Chunk size used when streaming images to disk and request bodies out.
+_CHUNK_SIZE = 64 * 1024
+
+# Total size of the cached results a client also keeps in memory.
+_MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+
+# Source images up to this size are read in one call instead of mmap'ed.
+_MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# urllib3 1.x rejects unknown connection kwargs such as blocksize when it
+# builds its pool keys.
+_URLLIB3_V2 = int(urllib3.__version__.split('.')[0]) >= 2
+
+
+class _PoolAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections send streamed bodies in larger blocks."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        if _URLLIB3_V2:
+            kwargs.setdefault('blocksize', _CHUNK_SIZE)
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _MmapReader(object):
+    """File-like view of an mmap whose seek() returns the new position.
+
+    httpx sizes file parts via seek(0, SEEK_END), which mmap answers with
+    None before Python 3.13, so uploads would fall back to chunked encoding.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+    def tell(self):
+        return self._buffer.tell()
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._buffer.seek(offset, whence)
+        return self._buffer.tell()
+
+
+# Shared session so clients created per call still reuse pooled connections.
+_DEFAULT_SESSION = requests.Session()
+_DEFAULT_SESSION.mount("https://", _PoolAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=(429, 500, 502, 503, 504))))
 
 
 class RemoveBg(object):
@@ -18,74 +130,197 @@ class RemoveBg(object):
         error_log_file,
         timeout: Optional[float] = None,
         session: Optional[requests.Session] = None,
+        cache_dir: Optional[str] = None,
+        warm_up: bool = False,
     ):
         """Create a new RemoveBg client.
 
         :param api_key: Your remove.bg API key.
-        :param error_log_file: Path to a log file. A basic file logger will be
-            configured if none exists yet.
+        :param error_log_file: Path to a log file that API and I/O errors
+            are written to.
         :param timeout: Optional request timeout (seconds) for each API
             call (default 30s).
         :param session: Optional ``requests.Session`` for connection reuse /
-            custom adapters.
+            custom adapters, or an ``httpx.Client`` (e.g. created with
+            ``http2=True``). Defaults to a pooled session shared by all
+            clients.
+        :param cache_dir: Optional directory for caching results. Calls with
+            an identical image and identical options are answered from the
+            cache without contacting the API.
+        :param warm_up: If True, open a connection to the API host right away
+            so the first call does not pay for DNS and the TLS handshake.
         """
         self.__api_key = api_key
         self._timeout = (
             timeout if timeout is not None else self.DEFAULT_TIMEOUT
         )
-        self._session = session or requests.Session()
-        # Configure root logging minimally if no handlers exist yet.
-        if not logging.getLogger().handlers:
-            logging.basicConfig(filename=error_log_file, level=logging.ERROR)
-        else:
-            # Add a file handler specifically for errors (best effort).
+        if httpx is not None and isinstance(session, httpx.AsyncClient):
+            raise TypeError(
+                "session must be a requests.Session or httpx.Client, "
+                "not httpx.AsyncClient")
+        self._session = session or _DEFAULT_SESSION
+        self._httpx = httpx is not None and isinstance(session, httpx.Client)
+        # The session may be shared between clients, so the API key is kept
+        # on the client and the header dict is built only once.
+        self._headers = {'X-Api-Key': api_key}
+        self._cache_dir = cache_dir
+        # Recently used cache entries, least recently used first.
+        self._memory_cache = collections.OrderedDict()
+        self._memory_cache_bytes = 0
+        self._memory_cache_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        if warm_up:
+            self._warm_up()
+        # Attach one handler per log file, however many clients are created.
+        log_path = os.path.abspath(error_log_file)
+        if log_path not in _installed_handlers:
             try:
-                fh = logging.FileHandler(error_log_file)
+                fh = logging.FileHandler(log_path)
                 fh.setLevel(logging.ERROR)
-                logging.getLogger().addHandler(fh)
+                fh.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+                _logger.addHandler(fh)
+                _installed_handlers.add(log_path)
             except Exception:  # pragma: no cover – best-effort logging setup.
                 pass
 
-    def _check_arguments(self, size, type, type_level, format, channels):
-        """Validate arguments against allowed remove.bg values."""
-        if size not in [
-                "auto", "preview", "small", "regular", "medium", "hd",
-                "full", "4k"]:
-            raise ValueError("size argument wrong")
-        if type not in [
-                "auto", "person", "product", "animal", "car",
-                "car_interior", "car_part", "transportation", "graphics",
-                "other"]:
-            raise ValueError("type argument wrong")
-        if type_level not in ["none", "latest", "1", "2"]:
-            raise ValueError("type_level argument wrong")
-        if format not in ["jpg", "zip", "png", "auto"]:
-            raise ValueError("format argument wrong")
-        if channels not in ["rgba", "alpha"]:
-            raise ValueError("channels argument wrong")
+    def _warm_up(self):
+        """Leave a pooled, TLS-established connection to the API host."""
+        try:
+            # The status code is irrelevant; only the open connection counts.
+            self._session.head(API_ENDPOINT, timeout=self._timeout).close()
+        except Exception:  # pragma: no cover – best effort.
+            pass
 
     def _output_file(self, response, new_file_name):
-        """Persist response content or log an error if the API call failed."""
-        if response.status_code == requests.codes.ok:
-            try:
-                with open(new_file_name, 'wb') as removed_bg_file:
-                    removed_bg_file.write(response.content)
-            except Exception as ex:  # pragma: no cover
-                _logger.error("Unable to write file %s: %s", new_file_name, ex)
-        else:
-            error_reason = "unknown error"
+        """Stream response content to disk or log an error if the call failed.
+
+        The body is written chunk by chunk instead of being buffered.
+        """
+        if response.status_code != requests.codes.ok:
+            self._log_error(response, new_file_name)
+            return
+        try:
+            if self._httpx:
+                chunks = response.iter_bytes(_CHUNK_SIZE)
+            else:
+                chunks = response.iter_content(_CHUNK_SIZE)
+            with open(new_file_name, 'wb') as removed_bg_file:
+                for chunk in chunks:
+                    removed_bg_file.write(chunk)
+        except Exception as ex:  # pragma: no cover
+            _logger.error("Unable to write file %s: %s", new_file_name, ex)
+
+    def _persist_bytes(self, content, new_file_name):
+        """Write already read result bytes to ``new_file_name``."""
+        try:
+            with open(new_file_name, 'wb') as removed_bg_file:
+                removed_bg_file.write(content)
+        except Exception as ex:  # pragma: no cover
+            _logger.error("Unable to write file %s: %s", new_file_name, ex)
+
+    def _log_error(self, response, new_file_name):
+        """Log the reason reported by the API for a failed call."""
+        error_reason = "unknown error"
+        payload = None
+        # Only parse JSON bodies; HTML/text error pages keep the generic
+        # reason.
+        if "json" in response.headers.get("content-type", ""):
+            body = response.read() if self._httpx else response.content
             try:
-                payload = response.json()
-                # remove.bg error schema: {"errors": [{"title": "...", ...}]}
-                if isinstance(payload, dict) and payload.get("errors"):
-                    error_reason = payload["errors"][0].get(
-                        "title", error_reason).lower()
+                payload = json.loads(body)
             except ValueError:
-                # Not JSON – keep generic reason.
                 pass
-            _logger.error(
-                "Unable to save %s due to %s (status %s)",
-                new_file_name, error_reason, response.status_code)
+        # remove.bg error schema: {"errors": [{"title": "...", ...}]}
+        if isinstance(payload, dict) and payload.get("errors"):
+            error_reason = payload["errors"][0].get(
+                "title", error_reason).lower()
+        _logger.error(
+            "Unable to save %s due to %s (status %s)",
+            new_file_name, error_reason, response.status_code)
+
+    def _cache_key(self, data, files, bg_path=None):
+        """Return the cache key for a request, or None if caching is off."""
+        if not self._cache_dir:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(sorted(data.items())).encode())
+        for field, (_, payload, _) in sorted(files.items()):
+            digest.update(field.encode() + b'\0')
+            digest.update(payload)
+        if bg_path:
+            with open(bg_path, 'rb') as bg_file:
+                for chunk in iter(lambda: bg_file.read(_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def _cache_path(self, cache_key):
+        return os.path.join(self._cache_dir, cache_key + '.bin')
+
+    def _cache_lookup(self, cache_key):
+        """Return cached result bytes for ``cache_key`` or None on a miss."""
+        if cache_key is None:
+            return None
+        path = self._cache_path(cache_key)
+        # Entries deleted from disk are dropped from memory as well.
+        if not os.path.exists(path):
+            self._forget(cache_key)
+            return None
+        with self._memory_cache_lock:
+            content = self._memory_cache.get(cache_key)
+            if content is not None:
+                self._memory_cache.move_to_end(cache_key)
+                return content
+        try:
+            with open(path, 'rb') as cache_file:
+                content = cache_file.read()
+        except OSError:
+            return None
+        self._remember(cache_key, content)
+        return content
+
+    def _remember(self, cache_key, content):
+        """Keep a result in memory, evicting the least recently used ones."""
+        if len(content) > _MEMORY_CACHE_BYTES:
+            return
+        with self._memory_cache_lock:
+            previous = self._memory_cache.pop(cache_key, None)
+            if previous is not None:
+                self._memory_cache_bytes -= len(previous)
+            self._memory_cache[cache_key] = content
+            self._memory_cache_bytes += len(content)
+            while self._memory_cache_bytes > _MEMORY_CACHE_BYTES:
+                _, evicted = self._memory_cache.popitem(last=False)
+                self._memory_cache_bytes -= len(evicted)
+
+    def _forget(self, cache_key):
+        """Drop a result from memory."""
+        with self._memory_cache_lock:
+            previous = self._memory_cache.pop(cache_key, None)
+            if previous is not None:
+                self._memory_cache_bytes -= len(previous)
+
+    def _cache_store(self, cache_key, content):
+        """Atomically add a result to the cache (best effort)."""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir,
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, self._cache_path(cache_key))
+            self._remember(cache_key, content)
+        except OSError as ex:  # pragma: no cover
+            _logger.error("Unable to cache result %s: %s", cache_key, ex)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _deliver_cached(self, content, new_file_name, return_bytes):
+        """Write and/or return a cached result like a fresh API response."""
+        if new_file_name:
+            self._persist_bytes(content, new_file_name)
+        if return_bytes:
+            return content
 
     def _build_common_data(self, size, type, type_level, format, roi, crop,
                            scale, position, channels, shadow,
@@ -98,15 +333,111 @@ class RemoveBg(object):
             'format': format,
             'roi': roi,
             # If crop margin provided enable cropping and pass as crop_margin.
-            'crop': 'true' if crop else 'false',
+            'crop': _BOOL[bool(crop)],
             'crop_margin': crop,
             'scale': scale,
             'position': position,
             'channels': channels,
-            'add_shadow': 'true' if shadow else 'false',
-            'semitransparency': 'true' if semitransparency else 'false',
+            'add_shadow': _BOOL[bool(shadow)],
+            'semitransparency': _BOOL[bool(semitransparency)],
         }
 
+    def _post(self, data, files):
+        """Start a streamed POST to the API on the configured client."""
+        if self._httpx:
+            if files:
+                files = {
+                    field: (name, _MmapReader(payload), *rest)
+                    if isinstance(payload, mmap.mmap)
+                    else (name, payload, *rest)
+                    for field, (name, payload, *rest) in files.items()}
+            # Unlike requests, httpx sends None form values as empty fields.
+            request = self._session.build_request(
+                'POST', API_ENDPOINT,
+                data={k: v for k, v in data.items() if v is not None},
+                files=files,
+                headers=self._headers,
+                timeout=self._timeout)
+            return self._session.send(request, stream=True)
+        if files and MultipartEncoder is not None:
+            # Stream the multipart body from the image buffers instead of
+            # letting requests join a full in-memory copy of the form. The
+            # encoder only takes str values, requests would str() them.
+            fields = {k: str(v) for k, v in data.items() if v is not None}
+            for field, (name, payload, *rest) in files.items():
+                # The encoder sizes plain buffers by len(), which an mmap
+                # keeps reporting after it has been read.
+                if isinstance(payload, mmap.mmap):
+                    payload = FileWrapper(payload)
+                fields[field] = (name, payload, *rest)
+            body = MultipartEncoder(fields=fields)
+            headers = {'Content-Type': body.content_type}
+            headers.update(self._headers)
+            return self._session.post(
+                API_ENDPOINT,
+                data=body,
+                headers=headers,
+                timeout=self._timeout,
+                stream=True)
+        return self._session.post(
+            API_ENDPOINT,
+            data=data,
+            files=files,
+            headers=self._headers,
+            timeout=self._timeout,
+            stream=True)
+
+    def _send(self, data, files_extra, bg, bg_type, new_file_name,
+              return_bytes):
+        """POST one image to the API and deliver the result.
+
+        ``data`` holds the validated form fields and ``files_extra`` the
+        uploaded image parts, if any; the background handling, caching and
+        result delivery are shared by all ``remove_background_from_*``
+        variants.
+        """
+        files = dict(files_extra)
+        bg_file_handle = None
+        try:
+            if bg_type == 'path' and bg:
+                bg_file_handle = open(bg, 'rb')
+                files['bg_image_file'] = (os.path.basename(bg),
+                                          bg_file_handle)
+            elif bg_type == 'color' and bg:
+                data['bg_color'] = bg
+            elif bg_type == 'url' and bg:
+                data['bg_image_url'] = bg
+
+            cache_key = self._cache_key(
+                data, files_extra, bg if bg_type == 'path' else None)
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return self._deliver_cached(
+                    cached, new_file_name, return_bytes)
+
+            response = self._post(data, files or None)
+            try:
+                response.raise_for_status()
+                if return_bytes or cache_key:
+                    content = (response.read() if self._httpx
+                               else response.content)
+                    if cache_key:
+                        self._cache_store(cache_key, content)
+                    if new_file_name:
+                        self._persist_bytes(content, new_file_name)
+                    if return_bytes:
+                        return content
+                elif new_file_name:
+                    self._output_file(response, new_file_name)
+            finally:
+                response.close()
+        finally:
+            if bg_file_handle:
+                try:
+                    bg_file_handle.close()
+                except Exception:
+                    pass
+
     def remove_background_from_img_file(self, img_file_path, size="regular",
                                         type="auto", type_level="none",
                                         format="auto", roi="0 0 100% 100%",
@@ -141,45 +472,37 @@ class RemoveBg(object):
         :param return_bytes: if True, return the raw result bytes.
         :return: None. Result saved to ``new_file_name``.
         """
-        self._check_arguments(size, type, type_level, format, channels)
+        _validate(size, type, type_level, format, channels)
 
-        files = {}
-        bg_file_handle = None
+        data = self._build_common_data(
+            size, type, type_level, format, roi, crop, scale,
+            position, channels, shadow, semitransparency)
+        # O_BINARY keeps Windows from opening the descriptor in text mode,
+        # which would translate CRLF and stop at 0x1A in PNG headers.
+        img_fd = os.open(img_file_path,
+                         os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        img_mmap = None
         try:
-            with open(img_file_path, 'rb') as img_file:
-                files['image_file'] = img_file
-                data = self._build_common_data(
-                    size, type, type_level, format, roi, crop, scale,
-                    position, channels, shadow, semitransparency)
-
-                if bg_type == 'path' and bg:
-                    bg_file_handle = open(bg, 'rb')
-                    files['bg_image_file'] = bg_file_handle
-                elif bg_type == 'color' and bg:
-                    data['bg_color'] = bg
-                elif bg_type == 'url' and bg:
-                    data['bg_image_url'] = bg
-
-                response = self._session.post(
-                    API_ENDPOINT,
-                    files=files,
-                    data=data,
-                    headers={'X-Api-Key': self.__api_key},
-                    timeout=self._timeout)
-                response.raise_for_status()
-                if return_bytes:
-                    content = response.content
-                    if new_file_name:
-                        self._output_file(response, new_file_name)
-                    return content
-                if new_file_name:
-                    self._output_file(response, new_file_name)
+            img_size = os.fstat(img_fd).st_size
+            if img_size > _MMAP_THRESHOLD:
+                # Map large images so the upload reads straight from the
+                # page cache instead of copying them into a bytes object.
+                img_mmap = mmap.mmap(img_fd, 0, access=mmap.ACCESS_READ)
+                img_bytes = img_mmap
+            else:
+                # read() loops until EOF, unlike a single os.read().
+                with open(img_fd, 'rb', closefd=False) as img_file:
+                    img_bytes = img_file.read()
+            image_file = (
+                os.path.basename(img_file_path),
+                img_bytes,
+                'application/octet-stream')
+            return self._send(data, {'image_file': image_file}, bg, bg_type,
+                              new_file_name, return_bytes)
         finally:
-            if bg_file_handle:
-                try:
-                    bg_file_handle.close()
-                except Exception:
-                    pass
+            if img_mmap is not None:
+                img_mmap.close()
+            os.close(img_fd)
 
     def remove_background_from_img_url(self, img_url, size="regular",
                                        type="auto", type_level="none",
@@ -212,50 +535,19 @@ class RemoveBg(object):
             to writing a file.
         """
 
-        self._check_arguments(size, type, type_level, format, channels)
+        _validate(size, type, type_level, format, channels)
 
         if not return_bytes and new_file_name is None:
             raise ValueError(
                 "Either provide new_file_name or set return_bytes=True"
             )
 
-        files = {}
-        bg_file_handle = None
-        try:
-            data = self._build_common_data(
-                size, type, type_level, format, roi, crop, scale,
-                position, channels, shadow, semitransparency)
-            data['image_url'] = img_url
+        data = self._build_common_data(
+            size, type, type_level, format, roi, crop, scale,
+            position, channels, shadow, semitransparency)
+        data['image_url'] = img_url
 
-            if bg_type == 'path' and bg:
-                bg_file_handle = open(bg, 'rb')
-                files['bg_image_file'] = bg_file_handle
-            elif bg_type == 'color' and bg:
-                data['bg_color'] = bg
-            elif bg_type == 'url' and bg:
-                data['bg_image_url'] = bg
-
-            response = self._session.post(
-                API_ENDPOINT,
-                data=data,
-                files=files if files else None,
-                headers={'X-Api-Key': self.__api_key},
-                timeout=self._timeout
-            )
-            response.raise_for_status()
-            if return_bytes:
-                content = response.content
-                if new_file_name:
-                    self._output_file(response, new_file_name)
-                return content
-            if new_file_name:
-                self._output_file(response, new_file_name)
-        finally:
-            if bg_file_handle:
-                try:
-                    bg_file_handle.close()
-                except Exception:
-                    pass
+        return self._send(data, {}, bg, bg_type, new_file_name, return_bytes)
 
     def remove_background_from_base64_img(self, base64_img, size="regular",
                                           type="auto", type_level="none",
@@ -265,7 +557,8 @@ class RemoveBg(object):
                                           shadow=False, semitransparency=True,
                                           bg=None, bg_type=None,
                                           new_file_name="no-bg.png",
-                                          return_bytes=False):
+                                          return_bytes=False,
+                                          send_as_b64=False):
         """
         Removes the background given a base64 image string.
 
@@ -285,49 +578,169 @@ class RemoveBg(object):
     :param bg_type: background kind (path/url/color)
         :param new_file_name: file name of the result image
         :param return_bytes: return raw image bytes optionally
+        :param send_as_b64: forward the base64 string as is instead of
+            uploading the decoded image bytes
         """
 
-        self._check_arguments(size, type, type_level, format, channels)
+        _validate(size, type, type_level, format, channels)
 
         if not return_bytes and new_file_name is None:
             raise ValueError(
                 "Either provide new_file_name or set return_bytes=True"
             )
 
+        data = self._build_common_data(
+            size, type, type_level, format, roi, crop, scale,
+            position, channels, shadow, semitransparency)
         files = {}
-        bg_file_handle = None
-        try:
-            data = self._build_common_data(
-                size, type, type_level, format, roi, crop, scale,
-                position, channels, shadow, semitransparency)
+        if send_as_b64:
             data['image_file_b64'] = base64_img
+        else:
+            # Binary upload is about a quarter smaller than the base64 text.
+            files['image_file'] = ('image', base64.b64decode(base64_img),
+                                   'application/octet-stream')
 
-            if bg_type == 'path' and bg:
-                bg_file_handle = open(bg, 'rb')
-                files['bg_image_file'] = bg_file_handle
-            elif bg_type == 'color' and bg:
-                data['bg_color'] = bg
-            elif bg_type == 'url' and bg:
-                data['bg_image_url'] = bg
+        return self._send(data, files, bg, bg_type, new_file_name,
+                          return_bytes)
 
-            response = self._session.post(
-                API_ENDPOINT,
-                data=data,
-                files=files if files else None,
-                headers={'X-Api-Key': self.__api_key},
-                timeout=self._timeout
-            )
-            response.raise_for_status()
-            if return_bytes:
-                content = response.content
-                if new_file_name:
-                    self._output_file(response, new_file_name)
-                return content
-            if new_file_name:
-                self._output_file(response, new_file_name)
-        finally:
-            if bg_file_handle:
-                try:
-                    bg_file_handle.close()
-                except Exception:
-                    pass
+    async def remove_background_from_img_files_async(
+            self, img_file_paths, concurrency=8, size="regular", type="auto",
+            type_level="none", format="auto", roi="0 0 100% 100%", crop=None,
+            scale="original", position="original", channels="rgba",
+            shadow=False, semitransparency=True, bg=None, bg_type=None,
+            new_file_names=None, http2=False):
+        """
+        Removes the background from many image files concurrently.
+
+        Requires the optional ``aiohttp`` and ``aiofiles`` packages
+        (``pip install removebg[async]``). All uploads share one connection
+        pool limited to ``concurrency`` simultaneous requests. With
+        ``http2=True`` the uploads are multiplexed over HTTP/2 through
+        ``httpx`` instead (``pip install removebg[http2]``).
+
+        :param img_file_paths: paths to the source image files
+        :param concurrency: maximum number of requests in flight
+        :param new_file_names: optional file names of the result images, one
+            per entry of ``img_file_paths``
+        :param http2: send the requests over HTTP/2 using ``httpx``
+        :return: list with the raw result bytes for each entry of
+            ``img_file_paths``, in order. If an image failed, its entry is
+            the raised exception instead; the other images still complete.
+
+        All other parameters match ``remove_background_from_img_file``.
+        """
+        import asyncio
+        import aiofiles
+
+        _validate(size, type, type_level, format, channels)
+
+        img_file_paths = list(img_file_paths)
+        if new_file_names is not None:
+            new_file_names = list(new_file_names)
+            if len(new_file_names) != len(img_file_paths):
+                raise ValueError(
+                    "new_file_names must match img_file_paths in length")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        data = self._build_common_data(
+            size, type, type_level, format, roi, crop, scale,
+            position, channels, shadow, semitransparency)
+        if bg_type == 'color' and bg:
+            data['bg_color'] = bg
+        elif bg_type == 'url' and bg:
+            data['bg_image_url'] = bg
+
+        bg_bytes = None
+        if bg_type == 'path' and bg:
+            async with aiofiles.open(bg, 'rb') as bg_file:
+                bg_bytes = await bg_file.read()
+
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        if http2:
+            if httpx is None:
+                raise ImportError("http2=True requires the httpx package")
+            fields = {k: str(v) for k, v in data.items() if v is not None}
+            http = httpx.AsyncClient(
+                http2=True, timeout=self._timeout,
+                limits=httpx.Limits(max_connections=concurrency,
+                                    max_keepalive_connections=concurrency))
+
+            async def post(img_bytes, img_file_path):
+                files = {'image_file': (os.path.basename(img_file_path),
+                                        img_bytes)}
+                if bg_bytes is not None:
+                    files['bg_image_file'] = (os.path.basename(bg), bg_bytes)
+                response = await http.post(API_ENDPOINT, data=fields,
+                                           files=files, headers=self._headers)
+                response.raise_for_status()
+                return response.content
+        else:
+            import aiohttp
+            http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=concurrency, ssl=True),
+                timeout=aiohttp.ClientTimeout(total=self._timeout))
+
+            async def post(img_bytes, img_file_path):
+                form = aiohttp.FormData()
+                for field, value in data.items():
+                    # requests silently drops None fields and str()s the
+                    # rest; mirror that here.
+                    if value is not None:
+                        form.add_field(field, str(value))
+                form.add_field('image_file', img_bytes,
+                               filename=os.path.basename(img_file_path))
+                if bg_bytes is not None:
+                    form.add_field('bg_image_file', bg_bytes,
+                                   filename=os.path.basename(bg))
+                async with http.post(API_ENDPOINT, data=form,
+                                     headers=self._headers) as response:
+                    response.raise_for_status()
+                    return await response.read()
+
+        async def process(index, img_file_path):
+            # Read inside the semaphore so at most ``concurrency`` images are
+            # held in memory at once.
+            async with semaphore:
+                async with aiofiles.open(img_file_path, 'rb') as img_file:
+                    img_bytes = await img_file.read()
+                cache_key = content = None
+                if self._cache_dir:
+                    # Same key as remove_background_from_img_file; hashing
+                    # and cache file I/O run off the event loop.
+                    image_file = (os.path.basename(img_file_path), img_bytes,
+                                  'application/octet-stream')
+                    cache_key = await loop.run_in_executor(
+                        None, self._cache_key, data,
+                        {'image_file': image_file},
+                        bg if bg_type == 'path' else None)
+                    content = await loop.run_in_executor(
+                        None, self._cache_lookup, cache_key)
+                if content is None:
+                    content = await post(img_bytes, img_file_path)
+                    if cache_key:
+                        await loop.run_in_executor(
+                            None, self._cache_store, cache_key, content)
+            if new_file_names is not None and new_file_names[index]:
+                async with aiofiles.open(
+                        new_file_names[index], 'wb') as removed_bg_file:
+                    await removed_bg_file.write(content)
+            return content
+
+        # One session per batch: aiohttp and httpx clients are bound to the
+        # event loop they were created on, which asyncio.run() replaces on
+        # every call.
+        async with http:
+            # Collect failures per image so one error neither cancels nor
+            # discards the uploads that are still running.
+            results = await asyncio.gather(*[
+                process(index, path)
+                for index, path in enumerate(img_file_paths)],
+                return_exceptions=True)
+        for img_file_path, result in zip(img_file_paths, results):
+            if isinstance(result, Exception):
+                _logger.error("Unable to remove background from %s: %s",
+                              img_file_path, result)
+        return results
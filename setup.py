@@ -13,6 +13,11 @@ setup(
   install_requires=[
           'requests'
       ],
+  extras_require={
+          'async': ['aiohttp', 'aiofiles'],
+          'http2': ['httpx[http2]', 'aiofiles'],
+          'stream': ['requests-toolbelt'],
+      },
   classifiers=[
     'Development Status :: 5 - Production/Stable',      # Chose either "3 - Alpha", "4 - Beta" or "5 - Production/Stable" as the current state of your package
     'Intended Audience :: Developers',      # Define that your audience are developers
@@ -0,0 +1,374 @@
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+import pytest
+import requests
+import urllib3
+
+from removebg import RemoveBg
+from removebg import removebg as removebg_module
+
+# PNG signature plus a chunk: CRLF and 0x1A bytes that text mode would mangle.
+_PNG = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\r\n\x1a\x00'
+
+
+class _FakeApiHandler(BaseHTTPRequestHandler):
+    """Answers like remove.bg: echoes the uploaded image as the result.
+
+    An image reading ``FAIL`` gets a 500 error and one reading ``SLOW`` is
+    answered after a delay.
+    """
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        fields = self._parse_fields(body)
+        self.server.received.append(fields)
+        image = fields.get('image_file', (None, b''))[1]
+        if image == b'FAIL':
+            self._reply(500, json.dumps(
+                {"errors": [{"title": "Server Error"}]}).encode(),
+                'application/json')
+            return
+        if image == b'SLOW':
+            time.sleep(0.3)
+        self._reply(200, b'no-bg:' + image, 'image/png')
+
+    def do_HEAD(self):
+        self.server.heads += 1
+        self._reply(404, b'', 'text/plain')
+
+    def _parse_fields(self, body):
+        content_type = self.headers['Content-Type']
+        if content_type.startswith('multipart/form-data'):
+            message = BytesParser().parsebytes(
+                b'Content-Type: ' + content_type.encode() + b'\r\n\r\n'
+                + body)
+            return {
+                part.get_param('name', header='content-disposition'):
+                    (part.get_filename(), part.get_payload(decode=True))
+                for part in message.get_payload()}
+        return {name: (None, value.encode())
+                for name, value in parse_qsl(body.decode())}
+
+    def _reply(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Run a fake API server and point the client at it."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeApiHandler)
+    server.received = []
+    server.heads = 0
+    thread = threading.Thread(target=server.serve_forever,
+                              kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    monkeypatch.setattr(removebg_module, 'API_ENDPOINT',
+                        'http://127.0.0.1:%d/' % server.server_port)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    return RemoveBg('api-key', str(tmp_path / 'error.log'))
+
+
+def _image(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_clients_share_one_handler_per_log_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    handlers = len(removebg_module._logger.handlers)
+
+    RemoveBg('api-key', str(tmp_path / 'error.log'))
+    RemoveBg('api-key', 'error.log')
+    removebg_module._logger.error("boom")
+
+    assert len(removebg_module._logger.handlers) == handlers + 1
+    assert (tmp_path / 'error.log').read_text() == "ERROR:removebg:boom\n"
+
+
+def test_errors_not_propagated_to_root_logger(tmp_path):
+    records = []
+    root_handler = logging.Handler()
+    root_handler.emit = records.append
+    logging.getLogger().addHandler(root_handler)
+    try:
+        RemoveBg('api-key', str(tmp_path / 'error.log'))
+        removebg_module._logger.error("boom")
+    finally:
+        logging.getLogger().removeHandler(root_handler)
+
+    assert records == []
+    assert 'boom' in (tmp_path / 'error.log').read_text()
+
+
+_API_ERROR = json.dumps({"errors": [{"title": "Invalid API Key"}]}).encode()
+
+
+@pytest.mark.parametrize('content_type, body, reason', [
+    ('application/json', _API_ERROR, 'invalid api key'),
+    ('text/html', _API_ERROR, 'unknown error'),
+    ('application/json', b'{not json', 'unknown error'),
+])
+def test_error_reason_parsed_only_from_json(client, tmp_path, content_type,
+                                            body, reason):
+    response = requests.Response()
+    response.status_code = 403
+    response.headers['Content-Type'] = content_type
+    response._content = body
+
+    client._log_error(response, 'joker-no-bg.png')
+
+    assert (tmp_path / 'error.log').read_text().endswith(
+        "Unable to save joker-no-bg.png due to %s (status 403)\n" % reason)
+
+
+def test_warm_up_opens_connection(api, tmp_path):
+    RemoveBg('api-key', str(tmp_path / 'error.log'), warm_up=True)
+
+    assert api.heads == 1
+
+
+def test_warm_up_failure_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(removebg_module, 'API_ENDPOINT', 'http://127.0.0.1:9/')
+
+    RemoveBg('api-key', str(tmp_path / 'error.log'), warm_up=True, timeout=1)
+
+
+@pytest.mark.parametrize('urllib3_v2', [True, False])
+def test_pool_adapter_upload(api, tmp_path, monkeypatch, urllib3_v2):
+    if urllib3_v2 and not urllib3.__version__.startswith('2'):
+        pytest.skip('urllib3 2.x is not installed')
+    monkeypatch.setattr(removebg_module, '_URLLIB3_V2', urllib3_v2)
+    adapter = removebg_module._PoolAdapter()
+    session = requests.Session()
+    session.mount('http://', adapter)
+    client = RemoveBg('api-key', str(tmp_path / 'error.log'),
+                      session=session)
+    img = _image(tmp_path, 'joker.jpg', b'IMG')
+
+    result = client.remove_background_from_img_file(
+        img, new_file_name=None, return_bytes=True)
+
+    assert result == b'no-bg:IMG'
+    assert (adapter.poolmanager.connection_pool_kw.get('blocksize')
+            == (removebg_module._CHUNK_SIZE if urllib3_v2 else None))
+
+
+def test_img_file_upload(api, client, tmp_path):
+    img = _image(tmp_path, 'joker.jpg', b'IMG')
+    out = tmp_path / 'joker-no-bg.png'
+
+    client.remove_background_from_img_file(img, crop=10,
+                                           new_file_name=str(out))
+
+    assert out.read_bytes() == b'no-bg:IMG'
+    fields = api.received[0]
+    assert fields['image_file'] == ('joker.jpg', b'IMG')
+    assert fields['crop'][1] == b'true'
+    assert fields['crop_margin'][1] == b'10'
+
+
+@pytest.mark.parametrize('toolbelt', [True, False])
+def test_large_img_file_upload_from_mmap(api, client, tmp_path, monkeypatch,
+                                         toolbelt):
+    if toolbelt and removebg_module.MultipartEncoder is None:
+        pytest.skip('requests-toolbelt is not installed')
+    if not toolbelt:
+        monkeypatch.setattr(removebg_module, 'MultipartEncoder', None)
+    monkeypatch.setattr(removebg_module, '_MMAP_THRESHOLD', 0)
+    img = _image(tmp_path, 'joker.jpg', b'IMG' * 1000)
+    bg = _image(tmp_path, 'bg.jpg', b'BG')
+
+    result = client.remove_background_from_img_file(
+        img, crop=10, bg=bg, bg_type='path', new_file_name=None,
+        return_bytes=True)
+
+    assert result == b'no-bg:' + b'IMG' * 1000
+    fields = api.received[0]
+    assert fields['bg_image_file'] == ('bg.jpg', b'BG')
+    assert fields['crop_margin'][1] == b'10'
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_png_uploaded_byte_for_byte(api, client, tmp_path, monkeypatch,
+                                    use_mmap):
+    if use_mmap:
+        monkeypatch.setattr(removebg_module, '_MMAP_THRESHOLD', 0)
+    img = _image(tmp_path, 'joker.png', _PNG)
+
+    result = client.remove_background_from_img_file(
+        img, new_file_name=None, return_bytes=True)
+
+    assert result == b'no-bg:' + _PNG
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_httpx_session_upload(api, tmp_path, monkeypatch, use_mmap):
+    httpx = pytest.importorskip('httpx')
+    if use_mmap:
+        monkeypatch.setattr(removebg_module, '_MMAP_THRESHOLD', 0)
+    img = _image(tmp_path, 'joker.png', _PNG)
+    bg = _image(tmp_path, 'bg.jpg', b'BG')
+    out = tmp_path / 'joker-no-bg.png'
+
+    with httpx.Client() as session:
+        client = RemoveBg('api-key', str(tmp_path / 'error.log'),
+                          session=session)
+        client.remove_background_from_img_file(
+            img, crop=10, bg=bg, bg_type='path', new_file_name=str(out))
+        result = client.remove_background_from_img_url(
+            'https://example.com/joker.jpg', new_file_name=None,
+            return_bytes=True)
+
+    assert out.read_bytes() == b'no-bg:' + _PNG
+    assert result == b'no-bg:'
+    fields = api.received[0]
+    assert fields['bg_image_file'] == ('bg.jpg', b'BG')
+    assert fields['crop_margin'][1] == b'10'
+    assert 'crop_margin' not in api.received[1]
+
+
+def test_httpx_async_client_rejected(tmp_path):
+    httpx = pytest.importorskip('httpx')
+
+    with pytest.raises(TypeError, match='AsyncClient'):
+        RemoveBg('api-key', str(tmp_path / 'error.log'),
+                 session=httpx.AsyncClient())
+
+
+def test_arguments_validated_before_opening_file(client, tmp_path):
+    with pytest.raises(ValueError, match='size argument wrong'):
+        client.remove_background_from_img_file(
+            str(tmp_path / 'missing.jpg'), size='huge')
+
+
+def test_base64_img_uploaded_as_binary(api, client):
+    result = client.remove_background_from_base64_img(
+        base64.b64encode(b'IMG').decode(), new_file_name=None,
+        return_bytes=True)
+
+    assert result == b'no-bg:IMG'
+    assert 'image_file_b64' not in api.received[0]
+
+
+def test_img_url_sent_as_form_field(api, client):
+    result = client.remove_background_from_img_url(
+        'https://example.com/joker.jpg', bg='red', bg_type='color',
+        new_file_name=None, return_bytes=True)
+
+    assert result == b'no-bg:'
+    fields = api.received[0]
+    assert fields['image_url'][1] == b'https://example.com/joker.jpg'
+    assert fields['bg_color'][1] == b'red'
+
+
+def test_cache_hit_skips_request(api, tmp_path):
+    client = RemoveBg('api-key', str(tmp_path / 'error.log'),
+                      cache_dir=str(tmp_path / 'cache'))
+    img = _image(tmp_path, 'joker.jpg', b'IMG')
+
+    first = client.remove_background_from_img_file(
+        img, new_file_name=None, return_bytes=True)
+    second = client.remove_background_from_img_file(
+        img, new_file_name=None, return_bytes=True)
+    other = client.remove_background_from_img_file(
+        img, size='hd', new_file_name=None, return_bytes=True)
+
+    assert first == second == other == b'no-bg:IMG'
+    assert len(api.received) == 2
+
+
+def test_cache_entry_deleted_from_disk_misses(api, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    client = RemoveBg('api-key', str(tmp_path / 'error.log'),
+                      cache_dir=str(cache_dir))
+    img = _image(tmp_path, 'joker.jpg', b'IMG')
+
+    client.remove_background_from_img_file(img, new_file_name=None,
+                                           return_bytes=True)
+    for entry in cache_dir.iterdir():
+        entry.unlink()
+    client.remove_background_from_img_file(img, new_file_name=None,
+                                           return_bytes=True)
+
+    assert len(api.received) == 2
+
+
+def test_async_batch_keeps_input_order(api, client, tmp_path):
+    pytest.importorskip('aiohttp')
+    pytest.importorskip('aiofiles')
+    paths = [_image(tmp_path, 'slow.jpg', b'SLOW'),
+             _image(tmp_path, 'fast.jpg', b'FAST')]
+    outs = [str(tmp_path / 'slow-no-bg.png'),
+            str(tmp_path / 'fast-no-bg.png')]
+
+    results = asyncio.run(client.remove_background_from_img_files_async(
+        paths, crop=10, new_file_names=outs))
+
+    assert results == [b'no-bg:SLOW', b'no-bg:FAST']
+    assert [open(out, 'rb').read() for out in outs] == results
+
+
+def test_async_batch_rejects_zero_concurrency(client, tmp_path):
+    pytest.importorskip('aiofiles')
+    img = _image(tmp_path, 'joker.jpg', b'IMG')
+
+    with pytest.raises(ValueError, match='concurrency'):
+        asyncio.run(asyncio.wait_for(
+            client.remove_background_from_img_files_async(
+                [img], concurrency=0), 2))
+
+
+def test_async_batch_reports_failures_per_item(api, client, tmp_path):
+    pytest.importorskip('aiohttp')
+    pytest.importorskip('aiofiles')
+    paths = [_image(tmp_path, 'slow.jpg', b'SLOW'),
+             _image(tmp_path, 'fail.jpg', b'FAIL'),
+             _image(tmp_path, 'fast.jpg', b'FAST')]
+    outs = [str(tmp_path / ('%d.png' % index)) for index in range(3)]
+
+    results = asyncio.run(client.remove_background_from_img_files_async(
+        paths, new_file_names=outs))
+
+    assert results[0] == b'no-bg:SLOW'
+    assert isinstance(results[1], Exception)
+    assert results[2] == b'no-bg:FAST'
+    assert open(outs[0], 'rb').read() == b'no-bg:SLOW'
+    assert not (tmp_path / '1.png').exists()
+
+
+def test_async_batch_shares_cache_with_sync_calls(api, tmp_path):
+    pytest.importorskip('aiohttp')
+    pytest.importorskip('aiofiles')
+    client = RemoveBg('api-key', str(tmp_path / 'error.log'),
+                      cache_dir=str(tmp_path / 'cache'))
+    img = _image(tmp_path, 'joker.jpg', b'IMG')
+
+    client.remove_background_from_img_file(img, new_file_name=None,
+                                           return_bytes=True)
+    results = asyncio.run(client.remove_background_from_img_files_async(
+        [img, img]))
+
+    assert results == [b'no-bg:IMG', b'no-bg:IMG']
+    assert len(api.received) == 1